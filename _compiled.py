@@ -0,0 +1,29 @@
+'''
+Ahead-of-time compiles the hot kernels of measure_metrics_CAN into the `measure_kernels` extension module,
+so that a run does not pay numba's JIT compile time on its first calculation.
+
+Build once (requires numba and a C compiler) from the repository root, and again after changing a kernel:
+    python _compiled.py
+
+The kernels are compiled from measure_metrics_CAN's own implementations, which it falls back to
+when `measure_kernels` cannot be imported or was built from other kernel sources.
+'''
+from numba.pycc import CC
+import measure_metrics_CAN
+
+cc = CC('measure_kernels')
+
+cc.export('npv', measure_metrics_CAN._KERNEL_SIGNATURES['npv'])(measure_metrics_CAN._npv.py_func)
+cc.export(
+    'utility_savings', measure_metrics_CAN._KERNEL_SIGNATURES['utility_savings']
+)(measure_metrics_CAN._utility_savings)
+
+# hash of the kernel sources compiled in, checked by measure_metrics_CAN on import
+SOURCE_HASH = measure_metrics_CAN._kernels_source_hash()
+
+@cc.export('source_hash', 'i8()')
+def source_hash():
+    return SOURCE_HASH
+
+if __name__ == '__main__':
+    cc.compile()
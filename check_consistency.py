@@ -0,0 +1,79 @@
+'''
+Checks that calculate_measure_metrics_batch and make_regional_calculator agree with calculate_measure_metrics,
+whose vectorized steps _measure_metrics_kernel re-implements in a single loop.
+
+Run from the repository root after changing any of the calculation steps:
+    python check_consistency.py
+'''
+import itertools
+import numpy as np
+from measure_metrics_CAN import (
+    Region, Units, calculate_measure_metrics, calculate_measure_metrics_batch, make_regional_calculator
+)
+
+# general inputs and financial scalars, as in measure_metrics_CAN.ipynb
+GENERAL_INPUTS = (2024, 509470, Units.SQ_FT)
+RATES = (0.14, 0.04, 2023, 0.03, 0.02, 0.01, 0.02)
+
+# measure inputs: (like_for_like_cost, measure_cost, implementation_year, measure_life,
+# electricity_kWh_savings, natural_gas_kWh_savings), including years before and beyond the reference data
+MEASURES = list(itertools.product(
+    [0, 1000], [350000], [2015, 2022, 2030, 2045], [1, 10, 25, 40], [-100000, 250000], [0, 520000]
+))
+
+def check_metrics(region: Region, calculate_regional_measure_metrics) -> list[str]:
+    '''
+    Returns the mismatches between the three calculations of the measure metrics for a region.
+    '''
+    context = (*GENERAL_INPUTS, region, *RATES)
+    batch = calculate_measure_metrics_batch(*context, *map(np.array, zip(*MEASURES)))
+
+    mismatches = []
+    for i, measure in enumerate(MEASURES):
+        single = calculate_measure_metrics(*context, *measure)
+        regional = calculate_regional_measure_metrics(*measure)
+        for key, value in single.items():
+            for path, other in (('batch', batch[key][i]), ('regional', regional[key])):
+                if not np.isclose(other, value, rtol=1e-6, atol=1e-6, equal_nan=True):
+                    mismatches.append(f"{region.value} {measure} {key}: {path} {other} != {value}")
+
+    return mismatches
+
+def check_errors(region: Region, calculate_regional_measure_metrics) -> list[str]:
+    '''
+    Returns the measure lives for which the three calculations do not raise the same error type.
+    '''
+    context = (*GENERAL_INPUTS, region, *RATES)
+    calculations = {
+        'single': lambda life: calculate_measure_metrics(*context, 0, 350000, 2025, life, -100000, 520000),
+        'batch': lambda life: calculate_measure_metrics_batch(*context, 0, 350000, 2025, np.array([life]), -100000, 520000),
+        'regional': lambda life: calculate_regional_measure_metrics(0, 350000, 2025, life, -100000, 520000),
+    }
+
+    mismatches = []
+    for measure_life in (0, -1):
+        errors = {}
+        for path, calculation in calculations.items():
+            try:
+                calculation(measure_life)
+                errors[path] = None
+            except Exception as error:
+                errors[path] = type(error).__name__
+        if len(set(errors.values())) > 1:
+            mismatches.append(f"{region.value} measure_life={measure_life}: {errors}")
+
+    return mismatches
+
+if __name__ == '__main__':
+    mismatches = []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for region in Region:
+            # the regional calculator compiles on its first call, so one is made per region
+            calculate_regional_measure_metrics = make_regional_calculator(*GENERAL_INPUTS, region, *RATES)
+            mismatches += check_metrics(region, calculate_regional_measure_metrics)
+            mismatches += check_errors(region, calculate_regional_measure_metrics)
+
+    for mismatch in mismatches:
+        print(mismatch)
+    print(f"{len(mismatches)} mismatches between calculate_measure_metrics, the batch and the regional calculator")
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,14 @@
+'''
+Converts the reference CSVs in reference_data into reference_data/tables.npz,
+which measure_metrics_CAN loads at import instead of parsing the CSVs.
+
+Re-run from the repository root after editing any of the reference CSVs:
+    python convert_reference_data.py
+'''
+import os
+import numpy as np
+from measure_metrics_CAN import read_reference_data, REFERENCE_TABLES_PATH
+
+if __name__ == '__main__':
+    np.savez(REFERENCE_TABLES_PATH, **read_reference_data())
+    print(f"Saved reference data tables to {os.path.relpath(REFERENCE_TABLES_PATH)}")
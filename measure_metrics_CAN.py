@@ -1,6 +1,29 @@
-import pandas as pd
+import functools
+import hashlib
+import inspect
+import os
+import warnings
+from dataclasses import dataclass
 import numpy as np
 from enum import Enum
+from types import MappingProxyType
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # numba is optional: without it the kernels run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    # ahead-of-time compiled kernels, built with `python _compiled.py` (checked against the sources below)
+    import measure_kernels
+except ImportError:
+    measure_kernels = None
 
 class Region(Enum):
     AB = 'AB'
@@ -25,102 +48,252 @@ class Units(Enum):
     SQ_M = 'm²'
     SQ_FT = 'ft²'
 
+@dataclass(frozen=True, slots=True)
+class IntensityTable:
+    '''
+    Region-specific carbon intensity per year, indexed by (year - base_year) up to the last year.
+    '''
+    base_year: int
+    values: np.ndarray
+    last_year: int
+
+# reference data paths
+_REFERENCE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference_data')
+_ELECTRICITY_INTENSITY_PATH = os.path.join(_REFERENCE_DATA_DIR, 'elec_grid_kgCO2_per_kWh.csv')
+_NATURAL_GAS_INTENSITY_PATH = os.path.join(_REFERENCE_DATA_DIR, 'natural_gas_kgCO2_per_kWh.csv')
+_CARBON_TAX_PATH = os.path.join(_REFERENCE_DATA_DIR, 'canada_carbon_tax.csv')
+REFERENCE_TABLES_PATH = os.path.join(_REFERENCE_DATA_DIR, 'tables.npz')
+
+def _reference_csvs_hash() -> str:
+    '''
+    Returns a SHA-256 hash of the bytes of the reference CSVs.
+    '''
+    digest = hashlib.sha256()
+    for path in (_ELECTRICITY_INTENSITY_PATH, _NATURAL_GAS_INTENSITY_PATH, _CARBON_TAX_PATH):
+        with open(path, 'rb') as csv_file:
+            # line endings normalized, so that a checkout with either line ending hashes the same
+            digest.update(csv_file.read().replace(b'\r\n', b'\n'))
+
+    return digest.hexdigest()
+
+def read_reference_data() -> dict[str, np.ndarray]:
+    '''
+    Reads the reference CSVs and returns their contents as NumPy arrays:
+        - elec_regions, elec_years, elec_intensity (region × year)
+        - gas_regions, gas_intensity (region)
+        - tax_year, tax_rate
+        - csv_hash, the hash of the CSVs read
+    '''
+    # pandas is only needed to parse the CSVs
+    import pandas as pd
+
+    elec = pd.read_csv(_ELECTRICITY_INTENSITY_PATH)
+    gas = pd.read_csv(_NATURAL_GAS_INTENSITY_PATH)
+    tax = pd.read_csv(_CARBON_TAX_PATH)
+
+    return {
+        'elec_regions': elec['region'].to_numpy(dtype=str),
+        'elec_years': elec.columns[1:].astype(int).to_numpy(),
+        'elec_intensity': elec.iloc[:, 1:].to_numpy(dtype=np.float64),
+        'gas_regions': gas['region'].to_numpy(dtype=str),
+        'gas_intensity': gas['all_years'].to_numpy(dtype=np.float64),
+        'tax_year': tax['year'].to_numpy(dtype=np.int64),
+        'tax_rate': tax['$_per_ton'].to_numpy(dtype=np.float64),
+        'csv_hash': np.array(_reference_csvs_hash()),
+    }
+
+def _load_reference_tables() -> dict[str, np.ndarray]:
+    '''
+    Loads the reference data tables built by convert_reference_data.py, 
+    or reads them from the CSVs if reference_data/tables.npz has not been built or was built from other CSVs.
+    '''
+    reference_tables = None
+    if os.path.exists(REFERENCE_TABLES_PATH):
+        with np.load(REFERENCE_TABLES_PATH) as tables:
+            # the archive is only used if built from the current CSVs
+            if 'csv_hash' in tables.files and tables['csv_hash'].item() == _reference_csvs_hash():
+                reference_tables = {key: tables[key] for key in tables.files}
+        
+        if reference_tables is None:
+            warnings.warn(
+                'reference_data/tables.npz was built from other reference CSVs, which are read instead; '
+                'run convert_reference_data.py to rebuild it'
+            )
+    
+    if reference_tables is None:
+        reference_tables = read_reference_data()
+    
+    for values in reference_tables.values():
+        values.flags.writeable = False
+
+    return reference_tables
+
+# reference data, loaded once at import
+_TABLES = _load_reference_tables()
+
+@functools.lru_cache(maxsize=None)
+def _electricity_intensity() -> tuple[np.ndarray, MappingProxyType]:
+    '''
+    Returns the years of the electricity grid intensity data and
+    a read-only mapping of region to a read-only array of intensity per year.
+    '''
+    table = dict(zip(_TABLES['elec_regions'].tolist(), _TABLES['elec_intensity']))
+
+    return _TABLES['elec_years'], MappingProxyType(table)
+
+@functools.lru_cache(maxsize=None)
+def _natural_gas_intensity() -> MappingProxyType:
+    '''
+    Returns a read-only mapping of region to natural gas carbon intensity.
+    '''
+    return MappingProxyType(dict(zip(_TABLES['gas_regions'].tolist(), _TABLES['gas_intensity'].tolist())))
+
+@functools.lru_cache(maxsize=None)
+def _load_carbon_tax() -> tuple[MappingProxyType, int, float]:
+    '''
+    Returns a read-only year-to-rate mapping of the carbon tax data,
+    the last available year (capped at 2050) and the rate for that year.
+    '''
+    carbon_tax_by_year = dict(zip(_TABLES['tax_year'].tolist(), _TABLES['tax_rate'].tolist()))
+    last_year = min(max(carbon_tax_by_year), 2050)
+
+    return MappingProxyType(carbon_tax_by_year), last_year, carbon_tax_by_year[last_year]
+
+@functools.lru_cache(maxsize=None)
+def _carbon_tax_vector() -> tuple[np.ndarray, int]:
+    '''
+    Returns the carbon tax rates as a read-only array indexed by (year - base year) up to the last year,
+    and the base year.
+    '''
+    carbon_tax_by_year, last_year, _ = _load_carbon_tax()
+    base_year = min(carbon_tax_by_year)
+
+    carbon_tax_rates = np.array(
+        [carbon_tax_by_year[year] for year in range(base_year, last_year + 1)], 
+        dtype=np.float64
+    )
+    carbon_tax_rates.flags.writeable = False
+
+    return carbon_tax_rates, base_year
+
+@functools.lru_cache(maxsize=None)
+def _measure_years(
+        implementation_year: int,
+        measure_life: int
+    ) -> np.ndarray:
+    '''
+    Returns a read-only array of the years over the measure life starting from the implementation year.
+    '''
+    years_arr = np.arange(implementation_year, implementation_year + measure_life, dtype=np.int32)
+    years_arr.flags.writeable = False
+
+    return years_arr
+
+@functools.lru_cache(maxsize=None)
 def load_region_emissions_intensity_data(
         region: Region, 
         fuel: Fuel
-    ) -> tuple[pd.DataFrame, int|None]:
+    ) -> IntensityTable|float:
     '''
     Loads the region-specific carbon intensity data based on the fuel type.
-    Returns a dictionary of year-to-intensity for electricity or a constant intensity for natural gas.
+    Returns an intensity table for electricity or a constant intensity for natural gas.
     '''
-    # emissions intensity data path
-    file_path = (
-        'reference_data/elec_grid_kgCO2_per_kWh.csv' 
-        if fuel is Fuel.ELECTRICITY 
-        else 'reference_data/natural_gas_kgCO2_per_kWh.csv'
-    )
-    df = pd.read_csv(file_path)
+    # natural gas intensity is constant for all years
+    if fuel is Fuel.NATURAL_GAS:
+        return _natural_gas_intensity()[region.value]
     
-    if fuel is Fuel.ELECTRICITY:
-        region_data = df[df['region'] == region.value].iloc[0, 1:].to_dict()
-        last_year = min(max(int(year) for year in df.columns[1:]), 2050)
-        return region_data, last_year
-    else:
-        region_data = df[df['region'] == region.value]['all_years'].values[0]
-        return region_data, None
+    years, table = _electricity_intensity()
+    base_year = int(years.min())
+    last_year = min(int(years.max()), 2050)
+    
+    intensity_table = IntensityTable(
+        base_year=base_year,
+        values=table[region.value][:last_year - base_year + 1],
+        last_year=last_year
+    )
+    return intensity_table
 
 def calculate_carbon_savings(
         region: Region, 
         kWh_savings: float, 
         measure_life: int, 
         implementation_year: int,
-        fuel: Fuel
-    ) -> list:
+        fuel: Fuel,
+        years_arr: np.ndarray|None = None
+    ) -> np.ndarray:
     '''
-    Returns a list of carbon savings in tCO₂e for the specified fuel type
+    Returns an array of carbon savings in tCO₂e for the specified fuel type
     over the measure life starting from the implementation year.
     '''
-    # load region-specific carbon intensity data
-    region_data, last_year = load_region_emissions_intensity_data(region, fuel)
-    
-    # get the range of years for the calculation
-    years = list(range(implementation_year, implementation_year + measure_life))
-    
     if fuel is Fuel.ELECTRICITY:
-        # fill in values beyond the last available year (e.g., 2050) with the last year's value
-        for year in years:
-            if str(year) not in region_data:
-                region_data[str(year)] = region_data[str(last_year)]
+        # load region-specific carbon intensity data
+        intensity_table = load_region_emissions_intensity_data(region, fuel)
+        
+        # get the range of years for the calculation, unless already provided
+        if years_arr is None:
+            years_arr = _measure_years(implementation_year, measure_life)
+        
+        # years outside the available data use the last year's value (e.g., 2038), before the first year as well
+        year_index = np.where(
+            years_arr < intensity_table.base_year, 
+            intensity_table.last_year, 
+            np.minimum(years_arr, intensity_table.last_year)
+        ) - intensity_table.base_year
         
         # calculate carbon savings per year for electricity
-        carbon_savings_per_year = [
-            (kWh_savings * region_data[str(year)])/1000 
-            for year in years
-        ]
+        carbon_savings_per_year = kWh_savings * intensity_table.values[year_index] / 1000
     else:
         # for natural gas, carbon intensity is constant for all years
-        carbon_savings_per_year = [
-            (kWh_savings * float(region_data))/1000 
-            for _ in years
-        ]
+        natural_gas_intensity = load_region_emissions_intensity_data(region, fuel)
+        carbon_savings_per_year = np.full(measure_life, kWh_savings * natural_gas_intensity / 1000)
     
     return carbon_savings_per_year
 
 def calculate_carbon_tax_savings(
-        natural_gas_carbon_savings_per_year: list, 
+        natural_gas_carbon_savings_per_year: np.ndarray, 
         measure_life: int, 
         implementation_year: int,
         consumer_price_index: float,
-    ) -> list:
+        years_arr: np.ndarray|None = None
+    ) -> np.ndarray:
     '''
-    Returns a list of carbon tax savings based on natural gas carbon savings
+    Returns an array of carbon tax savings based on natural gas carbon savings
     and carbon tax data over the measure life.
     '''
     # load the carbon tax data
-    file_path = 'reference_data/canada_carbon_tax.csv'
-    carbon_tax_data = pd.read_csv(file_path)
+    carbon_tax_vector, base_year = _carbon_tax_vector()
+    _, last_year, last_year_value = _load_carbon_tax()
     
-    # get the range of years for the calculation
-    years = list(range(implementation_year, implementation_year + measure_life))
-    last_year = min(max(int(year) for year in carbon_tax_data['year']), 2050)
-    last_year_value = carbon_tax_data.loc[carbon_tax_data['year'] == last_year, '$_per_ton'].values[0]
-
+    # get the range of years for the calculation, unless already provided
+    if years_arr is None:
+        years_arr = _measure_years(implementation_year, measure_life)
     
-    # fill in values beyond the last available year (e.g., 2050) with the last year's value
-    for year in years:
-        if year not in carbon_tax_data['year'].values:
-            inflated_value = last_year_value * ((1 + consumer_price_index) ** (year - last_year))
-            carbon_tax_data_beyond_2050 = pd.DataFrame({'year': [year], '$_per_ton': [inflated_value]})
-            carbon_tax_data = pd.concat([carbon_tax_data, carbon_tax_data_beyond_2050], ignore_index=True)
-
-    # convert carbon tax df to dict for lookup
-    carbon_tax_savings_dict = dict(zip(carbon_tax_data['year'], carbon_tax_data['$_per_ton']))
+    # carbon tax rate per year, with the years clipped to the available data
+    carbon_tax_rates = carbon_tax_vector[np.clip(years_arr, base_year, last_year) - base_year]
+    
+    # before the available data, deflate the last year's value (e.g., 2050) by the CPI
+    before_base_year = years_arr < base_year
+    if before_base_year.any():
+        carbon_tax_rates = np.where(
+            before_base_year, 
+            last_year_value * (1 + consumer_price_index) ** (years_arr - last_year), 
+            carbon_tax_rates
+        )
+    
+    # beyond the available data, inflate the last year's value (e.g., 2050) by a running product of the CPI
+    beyond_last_year = years_arr > last_year
+    if beyond_last_year.any():
+        inflation = np.cumprod(np.full(int(years_arr.max()) - last_year, 1 + consumer_price_index))
+        carbon_tax_rates = np.where(
+            beyond_last_year, 
+            last_year_value * inflation[np.maximum(years_arr - last_year, 1) - 1], 
+            carbon_tax_rates
+        )
     
     # calculate the carbon tax savings per year
-    carbon_tax_savings_per_year = [
-        round(natural_gas_carbon_savings_per_year[i] * carbon_tax_savings_dict[year],2) 
-        for i, year in enumerate(years)
-    ]
+    carbon_tax_savings_per_year = np.round(
+        np.asarray(natural_gas_carbon_savings_per_year) * carbon_tax_rates, 2
+    )
     
     return carbon_tax_savings_per_year
 
@@ -132,25 +305,18 @@ def calculate_natural_gas_base_kWh_rate(
     '''
     Returns the base value of the natural gas kWh rate without carbon tax, if applicable
     '''
-    natural_gas_base_kWh_rate = natural_gas_kWh_rate 
-    try:
-        # load carbon tax data
-        file_path = 'reference_data/canada_carbon_tax.csv'
-        carbon_tax_data = pd.read_csv(file_path)
-
-        # 'try' and get carbon tax data for a given utility rate reference year
-        year_index = carbon_tax_data[carbon_tax_data['year']==utility_rate_reference_year].index[0].item()
-        carbon_tax_value = carbon_tax_data.loc[year_index]['$_per_ton']
-
-        # load natural gas emissions intensity for a give region
-        file_path = 'reference_data/natural_gas_kgCO2_per_kWh.csv'
-        df = pd.read_csv(file_path)
-        natural_gas_emissions_intensity = df[df['region'] == region.value]['all_years'].values[0]
+    # get carbon tax data for a given utility rate reference year
+    carbon_tax_by_year, _, _ = _load_carbon_tax()
+    carbon_tax_value = carbon_tax_by_year.get(utility_rate_reference_year)
+    
+    # no carbon tax data for the reference year: the rate is used as is
+    if carbon_tax_value is None:
+        return natural_gas_kWh_rate
 
-        natural_gas_base_kWh_rate -= (natural_gas_emissions_intensity * carbon_tax_value / 1000)
+    # load natural gas emissions intensity for a give region
+    natural_gas_emissions_intensity = load_region_emissions_intensity_data(region, Fuel.NATURAL_GAS)
 
-    except:
-        pass
+    natural_gas_base_kWh_rate = natural_gas_kWh_rate - (natural_gas_emissions_intensity * carbon_tax_value / 1000)
     
     return natural_gas_base_kWh_rate
 
@@ -168,46 +334,258 @@ def calculate_future_rate(
     
     return future_rate
 
+def _utility_savings(
+        utility_kWh_savings: float,
+        utility_kWh_rate: float,
+        utility_inflation: float,
+        utility_rate_reference_year: int,
+        years_arr: np.ndarray
+    ) -> np.ndarray:
+    '''
+    Returns an array of utility savings for the given years, with the rate escalated by inflation.
+    Also compiled by _compiled.py as measure_kernels.utility_savings.
+    '''
+    # utility rates escalated by inflation (see calculate_future_rate)
+    years_delta = years_arr - utility_rate_reference_year
+    future_rates = utility_kWh_rate * (1 + utility_inflation) ** (years_delta - 1)
+    
+    # utility savings for each year
+    return np.round(utility_kWh_savings * future_rates, 2)
+
 def calculate_utility_savings(
         utility_kWh_savings: float,
         utility_kWh_rate: float,
         utility_inflation: float,
         utility_rate_reference_year: int,
         measure_life: int,
-        implementation_year: int
-    ) -> list:
+        implementation_year: int,
+        years_arr: np.ndarray|None = None
+    ) -> np.ndarray:
     '''
-    Returns a list of utility savings over the measure life.
+    Returns an array of utility savings over the measure life.
     '''
-    # utility rates escalated by inflation
-    years = list(range(implementation_year, implementation_year + measure_life))
-    future_rates = [
-        calculate_future_rate(utility_kWh_rate, utility_inflation, utility_rate_reference_year, year) 
-        for year in years
-    ]
+    # get the range of years for the calculation, unless already provided
+    if years_arr is None:
+        years_arr = _measure_years(implementation_year, measure_life)
     
-    # utility savings for each year
-    utility_savings_per_year = [
-        round(utility_kWh_savings * future_rate, 2) 
-        for future_rate in future_rates
-    ]
+    # use the ahead-of-time compiled kernel, if built
+    if measure_kernels is not None:
+        return measure_kernels.utility_savings(
+            float(utility_kWh_savings), 
+            float(utility_kWh_rate), 
+            float(utility_inflation), 
+            int(utility_rate_reference_year), 
+            np.ascontiguousarray(years_arr, dtype=np.int64)
+        )
     
-    return utility_savings_per_year
+    return _utility_savings(
+        utility_kWh_savings, 
+        utility_kWh_rate, 
+        utility_inflation, 
+        utility_rate_reference_year, 
+        years_arr
+    )
+
+@njit(cache=True, fastmath=True)
+def _npv(
+        incremental_cost: float,
+        cost_savings_per_year: np.ndarray,
+        discount_rate: float
+    ) -> float:
+    '''
+    Discounts the cost savings per year (starting at period 1) and nets them against the incremental cost.
+    '''
+    # running product of the discount factor, i.e. 1 / (1 + discount_rate)**period
+    discount_factor = 1.0 / (1 + discount_rate)
+    discount = 1.0
+
+    npv = -incremental_cost
+    for i in range(cost_savings_per_year.shape[0]):
+        discount *= discount_factor
+        npv += cost_savings_per_year[i] * discount
+    
+    return npv
+
+# signatures of the kernels compiled by _compiled.py into measure_kernels
+_KERNEL_SIGNATURES = {
+    'npv': 'f8(f8, f8[:], f8)',
+    'utility_savings': 'f8[:](f8, f8, f8, i8, i8[:])',
+}
+
+def _kernels_source_hash() -> int:
+    '''
+    Returns a hash of the sources and signatures of the kernels compiled by _compiled.py,
+    which _compiled.py exports as measure_kernels.source_hash.
+    '''
+    source = ''.join(inspect.getsource(getattr(kernel, 'py_func', kernel)) for kernel in (_npv, _utility_savings))
+    source += repr(_KERNEL_SIGNATURES)
+
+    # 60 bits, to fit the compiled kernel's int64 return value
+    return int(hashlib.sha256(source.encode('utf-8')).hexdigest()[:15], 16)
+
+# a measure_kernels built from other kernel sources (e.g. an older checkout) is not used
+if measure_kernels is not None and (
+        not hasattr(measure_kernels, 'source_hash') or measure_kernels.source_hash() != _kernels_source_hash()
+    ):
+    warnings.warn(
+        'measure_kernels was built from other kernel sources and is not used; '
+        'run _compiled.py to rebuild it'
+    )
+    measure_kernels = None
 
 def calculate_incremental_npv(
         incremental_cost: float,
-        cost_savings_per_year: list,
+        cost_savings_per_year: np.ndarray,
         discount_rate: float
     ) -> float:
     '''
     Calculates the incremental Net Present Value (NPV) of a measure.
     '''
-    cash_flows = [-incremental_cost] + cost_savings_per_year
-    cash_flows = np.array(cash_flows)
-    periods = np.arange(len(cash_flows))
-    npv = np.sum(cash_flows / (1 + discount_rate) ** periods)
-   
-    return round(npv, 2)
+    # use the ahead-of-time compiled kernel, if built, to skip the JIT compile on first call
+    npv_kernel = measure_kernels.npv if measure_kernels is not None else _npv
+    
+    npv = npv_kernel(
+        float(incremental_cost), 
+        np.ascontiguousarray(cost_savings_per_year, dtype=np.float64), 
+        float(discount_rate)
+    )
+    
+    # returned as a NumPy scalar so that ratios of the NPV follow NumPy division semantics
+    return np.round(npv, 2)
+
+@njit(cache=True, error_model='numpy')
+def _measure_metrics_kernel(
+        # general inputs
+        present_year, gross_floor_area_factor, electricity_kWh_rate, natural_gas_base_kWh_rate, 
+        utility_rate_reference_year,
+
+        # financial scalars
+        discount_rate, consumer_price_index, electricity_inflation, natural_gas_inflation,
+
+        # reference data
+        electricity_intensity, electricity_base_year, electricity_last_year, natural_gas_intensity,
+        carbon_tax_rates, carbon_tax_base_year, carbon_tax_last_year,
+
+        # measure inputs
+        like_for_like_cost, measure_cost, implementation_year, measure_life, 
+        electricity_kWh_savings, natural_gas_kWh_savings
+    ):
+    '''
+    Calculates the metrics of calculate_measure_metrics for one measure in a single pass over the measure life.
+    Returns the metrics as a tuple in the order of the calculate_measure_metrics keys.
+    Raises ZeroDivisionError for a measure life of zero and ValueError for a negative one,
+    as calculate_measure_metrics does.
+    '''
+    if measure_life == 0:
+        raise ZeroDivisionError('measure_life must be greater than zero')
+    if measure_life < 0:
+        raise ValueError('measure_life must be greater than zero')
+
+    carbon_tax_last_year_value = carbon_tax_rates[carbon_tax_last_year - carbon_tax_base_year]
+    discount_factor = 1.0 / (1 + discount_rate)
+    discount = 1.0
+
+    # natural gas carbon savings are constant for all years
+    natural_gas_carbon_savings = natural_gas_kWh_savings * natural_gas_intensity / 1000
+
+    electricity_carbon_savings_sum = 0.0
+    carbon_tax_savings_sum = 0.0
+    electricity_cost_savings_sum = 0.0
+    natural_gas_cost_savings_sum = 0.0
+    npv = 0.0
+
+    for i in range(measure_life):
+        year = implementation_year + i
+
+        # carbon savings, with years outside the available data using the last year's value
+        electricity_year = electricity_last_year if year < electricity_base_year else min(year, electricity_last_year)
+        electricity_carbon_savings_sum += (
+            electricity_kWh_savings * electricity_intensity[electricity_year - electricity_base_year] / 1000
+        )
+
+        # carbon tax savings, inflating (or, before the available data, deflating) the last year's value
+        if carbon_tax_base_year <= year <= carbon_tax_last_year:
+            carbon_tax_rate = carbon_tax_rates[year - carbon_tax_base_year]
+        else:
+            carbon_tax_rate = carbon_tax_last_year_value * (1 + consumer_price_index) ** (year - carbon_tax_last_year)
+        carbon_tax_savings = np.round(natural_gas_carbon_savings * carbon_tax_rate, 2)
+
+        # utility cost savings
+        years_delta = year - utility_rate_reference_year - 1
+        electricity_cost_savings = np.round(
+            electricity_kWh_savings * (electricity_kWh_rate * (1 + electricity_inflation) ** years_delta), 2
+        )
+        natural_gas_cost_savings = np.round(
+            natural_gas_kWh_savings * (natural_gas_base_kWh_rate * (1 + natural_gas_inflation) ** years_delta), 2
+        )
+
+        carbon_tax_savings_sum += carbon_tax_savings
+        electricity_cost_savings_sum += electricity_cost_savings
+        natural_gas_cost_savings_sum += natural_gas_cost_savings
+
+        # discounted total cost savings
+        discount *= discount_factor
+        npv += (carbon_tax_savings + electricity_cost_savings + natural_gas_cost_savings) * discount
+
+    # averages over the measure life
+    average_electricity_carbon_savings = electricity_carbon_savings_sum / measure_life
+    average_natural_gas_carbon_savings = natural_gas_carbon_savings
+    average_carbon_tax_savings = carbon_tax_savings_sum / measure_life
+    average_electricity_cost_savings = electricity_cost_savings_sum / measure_life
+    average_natural_gas_cost_savings = natural_gas_cost_savings_sum / measure_life
+
+    # incremental cost and NPV
+    cost_inflation = (1 + consumer_price_index) ** (implementation_year - present_year)
+    incremental_cost = (measure_cost - like_for_like_cost) * cost_inflation
+    incremental_npv = np.round(npv - incremental_cost, 2)
+
+    # total carbon savings, ROI, MAC and emissions intensity reduction
+    total_carbon_savings = measure_life * (average_electricity_carbon_savings + average_natural_gas_carbon_savings)
+    incremental_roi = incremental_npv / (incremental_cost * cost_inflation)
+    incremental_mac = - incremental_npv / total_carbon_savings
+    avg_kgCO2_intensity_reduction = 1000 * total_carbon_savings / measure_life / gross_floor_area_factor
+
+    return (
+        avg_kgCO2_intensity_reduction,
+        average_electricity_carbon_savings,
+        average_natural_gas_carbon_savings,
+        average_carbon_tax_savings,
+        average_electricity_cost_savings,
+        average_natural_gas_cost_savings,
+        incremental_npv,
+        incremental_roi,
+        incremental_mac
+    )
+
+@njit(parallel=True, cache=True)
+def _metrics_batch(
+        present_year, gross_floor_area_factor, electricity_kWh_rate, natural_gas_base_kWh_rate, 
+        utility_rate_reference_year,
+        discount_rate, consumer_price_index, electricity_inflation, natural_gas_inflation,
+        electricity_intensity, electricity_base_year, electricity_last_year, natural_gas_intensity,
+        carbon_tax_rates, carbon_tax_base_year, carbon_tax_last_year,
+        like_for_like_cost, measure_cost, implementation_year, measure_life, 
+        electricity_kWh_savings, natural_gas_kWh_savings
+    ):
+    '''
+    Runs _measure_metrics_kernel over arrays of measures in parallel.
+    Returns an array of shape (number of measures, number of metrics).
+    '''
+    n = measure_cost.shape[0]
+    metrics = np.empty((n, 9))
+
+    for i in prange(n):
+        metrics[i, :] = _measure_metrics_kernel(
+            present_year, gross_floor_area_factor, electricity_kWh_rate, natural_gas_base_kWh_rate, 
+            utility_rate_reference_year,
+            discount_rate, consumer_price_index, electricity_inflation, natural_gas_inflation,
+            electricity_intensity, electricity_base_year, electricity_last_year, natural_gas_intensity,
+            carbon_tax_rates, carbon_tax_base_year, carbon_tax_last_year,
+            like_for_like_cost[i], measure_cost[i], implementation_year[i], measure_life[i], 
+            electricity_kWh_savings[i], natural_gas_kWh_savings[i]
+        )
+    
+    return metrics
 
 def calculate_average_carbon_savings(
         region: Region,
@@ -215,36 +593,129 @@ def calculate_average_carbon_savings(
         natural_gas_kWh_savings: float,
         implementation_year: int,
         measure_life: int,
-    )-> tuple[float, float]:
+    )-> tuple[float, float, np.ndarray, np.ndarray]:
     '''
     Calculates the average annual carbon savings for a given fuel over the life of a measure.
+    Also returns the electricity and natural gas carbon savings per year used for the averages.
     '''
-    # initialize to 0
-    average_electricity_carbon_savings = 0
-    average_natural_gas_carbon_savings = 0
+    # carbon savings per year for each fuel
+    electricity_carbon_savings_per_year = calculate_carbon_savings(
+        region, 
+        electricity_kWh_savings, 
+        measure_life, 
+        implementation_year, 
+        Fuel.ELECTRICITY
+    )
+    natural_gas_carbon_savings_per_year = calculate_carbon_savings(
+        region, 
+        natural_gas_kWh_savings, 
+        measure_life, 
+        implementation_year, 
+        Fuel.NATURAL_GAS
+    )
+    
+    # annual averages (0 for a measure without any years)
+    average_electricity_carbon_savings = (
+        electricity_carbon_savings_per_year.mean() if len(electricity_carbon_savings_per_year) else 0
+    )
+    average_natural_gas_carbon_savings = (
+        natural_gas_carbon_savings_per_year.mean() if len(natural_gas_carbon_savings_per_year) else 0
+    )
+    
+    return (
+        average_electricity_carbon_savings, 
+        average_natural_gas_carbon_savings, 
+        electricity_carbon_savings_per_year, 
+        natural_gas_carbon_savings_per_year
+    )
 
-    fuels = [Fuel.ELECTRICITY, Fuel.NATURAL_GAS]
+@functools.lru_cache(maxsize=4096)
+def _cached_average_carbon_savings(
+        region: Region,
+        electricity_kWh_savings: float,
+        natural_gas_kWh_savings: float,
+        implementation_year: int,
+        measure_life: int,
+    ) -> tuple[float, float, np.ndarray, np.ndarray]:
+    '''
+    Memoized calculate_average_carbon_savings, with the savings per year as read-only arrays.
+    '''
+    (
+        average_electricity_carbon_savings, 
+        average_natural_gas_carbon_savings, 
+        electricity_carbon_savings_per_year, 
+        natural_gas_carbon_savings_per_year
+    ) = calculate_average_carbon_savings(
+        region,
+        electricity_kWh_savings,
+        natural_gas_kWh_savings,
+        implementation_year,
+        measure_life
+    )
+    electricity_carbon_savings_per_year.flags.writeable = False
+    natural_gas_carbon_savings_per_year.flags.writeable = False
 
-    for fuel in fuels:
+    return (
+        average_electricity_carbon_savings, 
+        average_natural_gas_carbon_savings, 
+        electricity_carbon_savings_per_year, 
+        natural_gas_carbon_savings_per_year
+    )
 
-        # selects fuel-specific kWh savings
-        kWh_savings = electricity_kWh_savings if fuel is Fuel.ELECTRICITY else natural_gas_kWh_savings
-        
-        carbon_savings_per_year = calculate_carbon_savings(
-            region, 
-            kWh_savings, 
-            measure_life, 
-            implementation_year, 
-            fuel
-        )
-        annual_average_carbon_savings = sum(carbon_savings_per_year)/len(carbon_savings_per_year) if carbon_savings_per_year else 0
-        
-        if fuel is Fuel.ELECTRICITY:
-            average_electricity_carbon_savings = annual_average_carbon_savings
-        else:
-            average_natural_gas_carbon_savings = annual_average_carbon_savings
+@functools.lru_cache(maxsize=4096)
+def _cached_carbon_tax_savings(
+        region: Region,
+        natural_gas_kWh_savings: float,
+        implementation_year: int,
+        measure_life: int,
+        consumer_price_index: float,
+    ) -> np.ndarray:
+    '''
+    Memoized calculate_carbon_tax_savings on the natural gas carbon savings of the given inputs,
+    with the savings per year as a read-only array.
+    '''
+    # natural gas carbon savings per year, constant and cheap to rebuild
+    natural_gas_carbon_savings_per_year = calculate_carbon_savings(
+        region, 
+        natural_gas_kWh_savings, 
+        measure_life, 
+        implementation_year, 
+        Fuel.NATURAL_GAS
+    )
     
-    return average_electricity_carbon_savings, average_natural_gas_carbon_savings
+    carbon_tax_savings_per_year = calculate_carbon_tax_savings(
+        natural_gas_carbon_savings_per_year, 
+        measure_life, 
+        implementation_year,
+        consumer_price_index
+    )
+    carbon_tax_savings_per_year.flags.writeable = False
+
+    return carbon_tax_savings_per_year
+
+@functools.lru_cache(maxsize=4096)
+def _cached_utility_savings(
+        utility_kWh_savings: float,
+        utility_kWh_rate: float,
+        utility_inflation: float,
+        utility_rate_reference_year: int,
+        measure_life: int,
+        implementation_year: int
+    ) -> np.ndarray:
+    '''
+    Memoized calculate_utility_savings, with the savings per year as a read-only array.
+    '''
+    utility_savings_per_year = calculate_utility_savings(
+        utility_kWh_savings, 
+        utility_kWh_rate, 
+        utility_inflation, 
+        utility_rate_reference_year, 
+        measure_life, 
+        implementation_year
+    )
+    utility_savings_per_year.flags.writeable = False
+
+    return utility_savings_per_year
 
 ## __main__ ##
 def calculate_measure_metrics(
@@ -285,7 +756,12 @@ def calculate_measure_metrics(
     '''
 
     # average annual carbon savings
-    average_electricity_carbon_savings, average_natural_gas_carbon_savings = calculate_average_carbon_savings(
+    (
+        average_electricity_carbon_savings, 
+        average_natural_gas_carbon_savings, 
+        _, 
+        _
+    ) = _cached_average_carbon_savings(
         region,
         electricity_kWh_savings,
         natural_gas_kWh_savings,
@@ -294,23 +770,17 @@ def calculate_measure_metrics(
     )
 
     # average carbon tax savings
-    natural_gas_carbon_savings_per_year = calculate_carbon_savings(
-        region, 
-        natural_gas_kWh_savings, 
-        measure_life, 
-        implementation_year, 
-        Fuel.NATURAL_GAS
-    )
-    carbon_tax_savings_per_year = calculate_carbon_tax_savings(
-        natural_gas_carbon_savings_per_year, 
-        measure_life, 
+    carbon_tax_savings_per_year = _cached_carbon_tax_savings(
+        region,
+        natural_gas_kWh_savings,
         implementation_year,
+        measure_life,
         consumer_price_index
     )
-    average_carbon_tax_savings = sum(carbon_tax_savings_per_year) / len(carbon_tax_savings_per_year) if carbon_tax_savings_per_year else 0
+    average_carbon_tax_savings = carbon_tax_savings_per_year.mean() if len(carbon_tax_savings_per_year) else 0
 
     # average utility cost savings: electricity
-    electricity_cost_savings_per_year = calculate_utility_savings(
+    electricity_cost_savings_per_year = _cached_utility_savings(
         electricity_kWh_savings, 
         electricity_kWh_rate, 
         electricity_inflation, 
@@ -318,7 +788,7 @@ def calculate_measure_metrics(
         measure_life, 
         implementation_year
     )
-    average_electricity_cost_savings = sum(electricity_cost_savings_per_year) / len(electricity_cost_savings_per_year) if electricity_cost_savings_per_year else 0
+    average_electricity_cost_savings = electricity_cost_savings_per_year.mean() if len(electricity_cost_savings_per_year) else 0
 
     # average utility cost savings: natural gas
     natural_gas_base_kWh_rate = calculate_natural_gas_base_kWh_rate(
@@ -326,7 +796,7 @@ def calculate_measure_metrics(
         natural_gas_kWh_rate,
         utility_rate_reference_year
     )
-    natural_gas_cost_savings_per_year = calculate_utility_savings(
+    natural_gas_cost_savings_per_year = _cached_utility_savings(
         natural_gas_kWh_savings, 
         natural_gas_base_kWh_rate, 
         natural_gas_inflation, 
@@ -334,17 +804,15 @@ def calculate_measure_metrics(
         measure_life, 
         implementation_year
     )
-    average_natural_gas_cost_savings = sum(natural_gas_cost_savings_per_year) / len(natural_gas_cost_savings_per_year) if natural_gas_cost_savings_per_year else 0
+    average_natural_gas_cost_savings = natural_gas_cost_savings_per_year.mean() if len(natural_gas_cost_savings_per_year) else 0
 
     # incremental cost
     incremental_cost = (measure_cost - like_for_like_cost) * (1 + consumer_price_index)**(implementation_year - present_year)
 
     # total cost savings per year (utilities and carbon tax)
-    total_cost_savings_per_year = [
-        carbon_tax_cost + electricity_cost + natural_gas_cost
-        for carbon_tax_cost, electricity_cost, natural_gas_cost 
-        in zip(carbon_tax_savings_per_year, electricity_cost_savings_per_year, natural_gas_cost_savings_per_year)
-    ]
+    total_cost_savings_per_year = (
+        carbon_tax_savings_per_year + electricity_cost_savings_per_year + natural_gas_cost_savings_per_year
+    )
 
     # incremental NPV
     incremental_npv = calculate_incremental_npv(
@@ -378,6 +846,187 @@ def calculate_measure_metrics(
         'incremental_mac': incremental_mac
     }
 
+_MEASURE_METRICS_KEYS = (
+    'avg_emissions_intensity_reduction',
+    'avg_electricity_carbon_savings',
+    'avg_natural_gas_carbon_savings',
+    'avg_carbon_tax_savings',
+    'avg_electricity_cost_savings',
+    'avg_natural_gas_cost_savings',
+    'incremental_npv',
+    'incremental_roi',
+    'incremental_mac'
+)
+
+def calculate_measure_metrics_batch(
+        # general inputs
+        present_year: int,
+        gross_floor_area: float,
+        gross_floor_area_unit: Units,
+        region: Region,
+        electricity_kWh_rate: float,
+        natural_gas_kWh_rate: float,
+        utility_rate_reference_year: int,
+
+        # financial scalars
+        discount_rate: float,
+        consumer_price_index: float,
+        electricity_inflation: float,
+        natural_gas_inflation: float,
+
+        # measure inputs, one value per measure
+        like_for_like_cost: np.ndarray,
+        measure_cost: np.ndarray,
+        implementation_year: np.ndarray,
+        measure_life: np.ndarray,
+        electricity_kWh_savings: np.ndarray,
+        natural_gas_kWh_savings: np.ndarray
+    ) -> dict:
+    '''
+    Calculates the metrics of calculate_measure_metrics for many measures sharing the same general inputs
+    and financial scalars. Measure inputs are arrays (scalars are broadcast) and the returned dict holds
+    one array per metric, in measure order.
+    Raises ZeroDivisionError if any measure life is zero and ValueError if any is negative,
+    as calculate_measure_metrics does.
+    '''
+    # reference data, looked up once for all measures
+    intensity_table = load_region_emissions_intensity_data(region, Fuel.ELECTRICITY)
+    natural_gas_intensity = load_region_emissions_intensity_data(region, Fuel.NATURAL_GAS)
+    carbon_tax_rates, carbon_tax_base_year = _carbon_tax_vector()
+    _, carbon_tax_last_year, _ = _load_carbon_tax()
+
+    natural_gas_base_kWh_rate = calculate_natural_gas_base_kWh_rate(
+        region,
+        natural_gas_kWh_rate,
+        utility_rate_reference_year
+    )
+    gross_floor_area_factor = gross_floor_area / (1 if gross_floor_area_unit is Units.SQ_FT else 10.7639)
+
+    # measure inputs as contiguous struct-of-arrays
+    (
+        like_for_like_cost, 
+        measure_cost, 
+        implementation_year, 
+        measure_life, 
+        electricity_kWh_savings, 
+        natural_gas_kWh_savings
+    ) = np.broadcast_arrays(
+        np.asarray(like_for_like_cost, dtype=np.float64),
+        np.asarray(measure_cost, dtype=np.float64),
+        np.asarray(implementation_year, dtype=np.int64),
+        np.asarray(measure_life, dtype=np.int64),
+        np.asarray(electricity_kWh_savings, dtype=np.float64),
+        np.asarray(natural_gas_kWh_savings, dtype=np.float64)
+    )
+
+    # an exception raised inside the parallel loop would be lost, so check the measure lives up front
+    if np.any(measure_life == 0):
+        raise ZeroDivisionError('measure_life must be greater than zero')
+    if np.any(measure_life < 0):
+        raise ValueError('measure_life must be greater than zero')
+
+    metrics = _metrics_batch(
+        int(present_year), float(gross_floor_area_factor), float(electricity_kWh_rate), 
+        float(natural_gas_base_kWh_rate), int(utility_rate_reference_year),
+        float(discount_rate), float(consumer_price_index), float(electricity_inflation), float(natural_gas_inflation),
+        intensity_table.values, intensity_table.base_year, intensity_table.last_year, natural_gas_intensity,
+        carbon_tax_rates, carbon_tax_base_year, carbon_tax_last_year,
+        np.ascontiguousarray(like_for_like_cost.ravel()), 
+        np.ascontiguousarray(measure_cost.ravel()), 
+        np.ascontiguousarray(implementation_year.ravel()), 
+        np.ascontiguousarray(measure_life.ravel()), 
+        np.ascontiguousarray(electricity_kWh_savings.ravel()), 
+        np.ascontiguousarray(natural_gas_kWh_savings.ravel())
+    )
+
+    return {key: metrics[:, i] for i, key in enumerate(_MEASURE_METRICS_KEYS)}
+
+def make_regional_calculator(
+        # general inputs
+        present_year: int,
+        gross_floor_area: float,
+        gross_floor_area_unit: Units,
+        region: Region,
+        electricity_kWh_rate: float,
+        natural_gas_kWh_rate: float,
+        utility_rate_reference_year: int,
+
+        # financial scalars
+        discount_rate: float,
+        consumer_price_index: float,
+        electricity_inflation: float,
+        natural_gas_inflation: float
+    ):
+    '''
+    Returns a calculate_measure_metrics specialized on the given general inputs and financial scalars.
+    The returned function takes the measure inputs only and returns the same dict of metrics.
+    '''
+    # reference data and rates baked into the kernel as constants
+    intensity_table = load_region_emissions_intensity_data(region, Fuel.ELECTRICITY)
+    natural_gas_intensity = load_region_emissions_intensity_data(region, Fuel.NATURAL_GAS)
+    carbon_tax_rates, carbon_tax_base_year = _carbon_tax_vector()
+    _, carbon_tax_last_year, _ = _load_carbon_tax()
+
+    electricity_intensity = intensity_table.values
+    electricity_base_year = intensity_table.base_year
+    electricity_last_year = intensity_table.last_year
+
+    natural_gas_base_kWh_rate = float(calculate_natural_gas_base_kWh_rate(
+        region,
+        natural_gas_kWh_rate,
+        utility_rate_reference_year
+    ))
+    gross_floor_area_factor = float(gross_floor_area / (1 if gross_floor_area_unit is Units.SQ_FT else 10.7639))
+
+    present_year = int(present_year)
+    electricity_kWh_rate = float(electricity_kWh_rate)
+    utility_rate_reference_year = int(utility_rate_reference_year)
+    discount_rate = float(discount_rate)
+    consumer_price_index = float(consumer_price_index)
+    electricity_inflation = float(electricity_inflation)
+    natural_gas_inflation = float(natural_gas_inflation)
+
+    @njit
+    def _calc(
+            like_for_like_cost, measure_cost, implementation_year, measure_life, 
+            electricity_kWh_savings, natural_gas_kWh_savings
+        ):
+        return _measure_metrics_kernel(
+            present_year, gross_floor_area_factor, electricity_kWh_rate, natural_gas_base_kWh_rate, 
+            utility_rate_reference_year,
+            discount_rate, consumer_price_index, electricity_inflation, natural_gas_inflation,
+            electricity_intensity, electricity_base_year, electricity_last_year, natural_gas_intensity,
+            carbon_tax_rates, carbon_tax_base_year, carbon_tax_last_year,
+            like_for_like_cost, measure_cost, implementation_year, measure_life, 
+            electricity_kWh_savings, natural_gas_kWh_savings
+        )
+
+    def calculate_regional_measure_metrics(
+            like_for_like_cost: float,
+            measure_cost: float,
+            implementation_year: int,
+            measure_life: int,
+            electricity_kWh_savings: float,
+            natural_gas_kWh_savings: float
+        ) -> dict:
+        '''
+        Calculates the metrics of calculate_measure_metrics for one measure with the general inputs
+        and financial scalars given to make_regional_calculator.
+        The first call compiles the kernel afresh for every make_regional_calculator call,
+        since a closure over those inputs cannot use numba's cache=True.
+        '''
+        metrics = _calc(
+            float(like_for_like_cost), 
+            float(measure_cost), 
+            int(implementation_year), 
+            int(measure_life), 
+            float(electricity_kWh_savings), 
+            float(natural_gas_kWh_savings)
+        )
+        return dict(zip(_MEASURE_METRICS_KEYS, metrics))
+
+    return calculate_regional_measure_metrics
+
 def print_measure_metrics(measure_metrics: dict):
     '''
     Prints the calculated measure metrics.